@@ -1,88 +1,122 @@
 import os
+import atexit
 import logging
+import logging.handlers
 import argparse
-import pytz
+import multiprocessing
+import pathlib
 
 from lib.JSONFileManager import JSONFileManager
 from lib.MediaProcessor import MediaProcessor
 
-la_timezone = pytz.timezone("America/Los_Angeles")
+# Global MediaProcessor
+media_processor = None
 
-# Create a logger
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)  # Set the minimum logging level for the logger
 
-# Create a file handler for DEBUG level and above
-file_handler = logging.FileHandler("results.log", mode="w")
-file_handler.setLevel(logging.DEBUG)  # Log DEBUG and higher levels to the file
-file_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Wire up root logging and start the queue listener that drains it.
 
-# Create a console handler for INFO level and above
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)  # Log INFO and higher levels to the console
-console_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+    Must only run in the main process: worker processes re-import this
+    module on spawn/forkserver platforms, and running this at import time
+    there would truncate results.log and start duplicate listeners.
 
+    Returns:
+        logging.handlers.QueueListener: The started listener.
+    """
+    # Create a logger
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO)  # INFO by default; --verbose raises to DEBUG
 
-# Global MediaProcessor
-media_processor = None
+    # Create a file handler for everything the logger emits
+    file_handler = logging.FileHandler("results.log", mode="w")
+    file_handler.setLevel(logging.DEBUG)
+    file_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+    file_handler.setFormatter(file_formatter)
+
+    # Create a console handler for INFO level and above
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)  # Log INFO and higher levels to the console
+    console_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+    console_handler.setFormatter(console_formatter)
+
+    # Route records through a queue so hot-path logging never blocks on a
+    # write()/flush; a dedicated listener drains the queue into the handlers.
+    # A multiprocessing queue lets the EXIF worker processes log through it too.
+    log_queue = multiprocessing.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True)
+    log_listener.start()
+    return log_listener
+
+
+def process_media_items(pairs) -> None:
+    """
+    Feed (media_item, save_directory) pairs to the media processor and wait
+    for the submitted work to complete.
+
+    Classification and dedup run inline (they are cheap); the heavy EXIF
+    rewrites and file copies execute on MediaProcessor's internal pools.
+
+    Args:
+        pairs: Iterable of (media_item, save_directory) tuples.
+    """
+    for media_item, save_directory in pairs:
+        media_processor.process_media_item(media_item, save_directory)
+
+    media_processor.flush()
 
 
-def extract_albums() -> int:
+def extract_albums(json_files) -> int:
     # Load all the JSON files for this section
-    target_path = os.path.join(args.path, 'your_facebook_activity/posts/album/*.json')
-    file_manager = JSONFileManager(target_path)
+    file_manager = JSONFileManager(json_files)
     json_header_key = "photos"
 
     # Keep Count of count differences
     starting_count = media_processor.get_total_processed()
 
-    # Parse Through the JSON Files
-    for json_file in file_manager.files:
-        data = file_manager.load_json_file(json_file)
+    # Stream Through the JSON Files
+    def iter_pairs():
+        for json_file in file_manager.files:
+            # Get Album Meta Data
+            album_name = next(file_manager.iter_items(json_file, 'name'), '')
+            save_directory = os.path.join(args.save_path, 'albums', album_name)
 
-        # Get Album Meta Data
-        album_name = data.get('name', '')
-        save_directory = os.path.join(args.save_path, 'albums', album_name)
+            # Stream each media item
+            for media_item in file_manager.iter_items(json_file, f'{json_header_key}.item'):
+                yield (media_item, save_directory)
 
-        # Process each media item
-        for media_item in data.get(json_header_key, []):
-            media_processor.process_media_item(media_item, save_directory)
+    process_media_items(iter_pairs())
 
     processed_count = media_processor.get_total_processed() - starting_count
     logging.info(f"Processed {processed_count} Album Media Items {os.path.join(args.save_path, 'albums')}")
 
 
-def extract_posts() -> int:
+def extract_posts(json_files) -> int:
     # Load all the JSON files for this section
-    target_path = os.path.join(
-        args.path, 'your_facebook_activity/posts/your_posts__check_ins__photos_and_videos*.json')
-    file_manager = JSONFileManager(target_path)
+    file_manager = JSONFileManager(json_files)
     save_directory = os.path.join(args.save_path, 'posts')
 
     # Keep Count of count differences
     starting_count = media_processor.get_total_processed()
 
-    # Parse Through the JSON Files
-    for json_file in file_manager.files:
-        data = file_manager.load_json_file(json_file)
+    # Stream Through the JSON Files (posts files are a top-level array)
+    def iter_pairs():
+        for json_file in file_manager.files:
+            for post in file_manager.iter_items(json_file, 'item'):
+                for attachment_data in media_processor.extract_attachment_data(post):
+                    if 'media' in attachment_data:
+                        yield (attachment_data['media'], save_directory)
 
-        # Extract and process media items from posts
-        for post in data:
-            for attachment_data in media_processor.extract_attachment_data(post):
-                if 'media' in attachment_data:
-                    media_processor.process_media_item(attachment_data['media'], save_directory)
+    process_media_items(iter_pairs())
 
     processed_count = media_processor.get_total_processed() - starting_count
     logging.info(f"Processed {processed_count} Post Media Items in {save_directory}.")
 
 
-def extract_misc() -> int:
+def extract_misc(json_files) -> int:
     # Define file paths and header key
-    target_path = os.path.join(args.path, 'your_facebook_activity/posts/your_uncategorized_photos*.json')
     save_directory = os.path.join(args.save_path, 'uncategorized_photos')
     json_header_key = "other_photos_v2"
 
@@ -90,21 +124,22 @@ def extract_misc() -> int:
     starting_count = media_processor.get_total_processed()
 
     # Load JSON files
-    file_manager = JSONFileManager(target_path)
+    file_manager = JSONFileManager(json_files)
 
-    # Parse and process each file
-    for json_file in file_manager.files:
-        data = file_manager.load_json_file(json_file)
-        for entry in data.get(json_header_key, []):
-            media_processor.process_media_item(entry, save_directory)
+    # Stream from each file
+    def iter_pairs():
+        for json_file in file_manager.files:
+            for entry in file_manager.iter_items(json_file, f'{json_header_key}.item'):
+                yield (entry, save_directory)
+
+    process_media_items(iter_pairs())
 
     processed_count = media_processor.get_total_processed() - starting_count
     logging.info(f"Processed {processed_count} Misc Media Items in {save_directory}.")
 
 
-def extract_videos() -> int:
+def extract_videos(json_files) -> int:
     # Define file paths and header key
-    target_path = os.path.join(args.path, 'your_facebook_activity/posts/your_videos*.json')
     save_directory = os.path.join(args.save_path, 'videos')
     json_header_key = "videos_v2"
 
@@ -112,22 +147,22 @@ def extract_videos() -> int:
     starting_count = media_processor.get_total_processed()
 
     # Load JSON files
-    file_manager = JSONFileManager(target_path)
+    file_manager = JSONFileManager(json_files)
 
-    # Parse Through the JSON Files
-    for json_file in file_manager.files:
-        data = file_manager.load_json_file(json_file)
+    # Stream Through the JSON Files
+    def iter_pairs():
+        for json_file in file_manager.files:
+            for entry in file_manager.iter_items(json_file, f'{json_header_key}.item'):
+                yield (entry, save_directory)
 
-        for entry in data.get(json_header_key, []):
-            media_processor.process_media_item(entry, save_directory)
+    process_media_items(iter_pairs())
 
     processed_count = media_processor.get_total_processed() - starting_count
     logging.info(f"Processed {processed_count} Video Media Items in {save_directory}.")
 
 
-def extract_stories() -> int:
+def extract_stories(json_files) -> int:
     # Define file paths and header key
-    target_path = os.path.join(args.path, 'your_facebook_activity/stories/archived_stories*.json')
     save_directory = os.path.join(args.save_path, 'stories')
     json_header_key = "archived_stories_v2"
 
@@ -135,23 +170,24 @@ def extract_stories() -> int:
     starting_count = media_processor.get_total_processed()
 
     # Load JSON files
-    file_manager = JSONFileManager(target_path)
+    file_manager = JSONFileManager(json_files)
+
+    # Stream Through the JSON Files
+    def iter_pairs():
+        for json_file in file_manager.files:
+            for entry in file_manager.iter_items(json_file, f'{json_header_key}.item'):
+                for attachment_data in media_processor.extract_attachment_data(entry):
+                    if 'media' in attachment_data:
+                        yield (attachment_data['media'], save_directory)
 
-    # Parse Through the JSON Files
-    for json_file in file_manager.files:
-        data = file_manager.load_json_file(json_file)
-        for entry in data.get(json_header_key, []):
-            for attachment_data in media_processor.extract_attachment_data(entry):
-                if 'media' in attachment_data:
-                    media_processor.process_media_item(attachment_data['media'], save_directory)
+    process_media_items(iter_pairs())
 
     processed_count = media_processor.get_total_processed() - starting_count
     logging.info(f"Processed {processed_count} Story Media Items in {save_directory}.")
 
 
-def process_reels() -> int:
+def process_reels(json_files) -> int:
     # Define file paths and header key
-    target_path = os.path.join(args.path, 'your_facebook_activity/short_videos/your_reels*.json')
     save_directory = os.path.join(args.save_path, 'reels')
     json_header_key = "lasso_videos_v2"
 
@@ -159,16 +195,17 @@ def process_reels() -> int:
     starting_count = media_processor.get_total_processed()
 
     # Load JSON files
-    file_manager = JSONFileManager(target_path)
+    file_manager = JSONFileManager(json_files)
 
-    # Parse Through the JSON Files
-    for json_file in file_manager.files:
-        data = file_manager.load_json_file(json_file)
+    # Stream Through the JSON Files
+    def iter_pairs():
+        for json_file in file_manager.files:
+            for entry in file_manager.iter_items(json_file, f'{json_header_key}.item'):
+                for attachment_data in media_processor.extract_attachment_data(entry):
+                    if 'media' in attachment_data:
+                        yield (attachment_data['media'], save_directory)
 
-        for entry in data.get(json_header_key, []):
-            for attachment_data in media_processor.extract_attachment_data(entry):
-                if 'media' in attachment_data:
-                    media_processor.process_media_item(attachment_data['media'], save_directory)
+    process_media_items(iter_pairs())
 
     processed_count = media_processor.get_total_processed() - starting_count
     logging.info(f"Processed {processed_count} Reel Media Items in {save_directory}.")
@@ -188,51 +225,102 @@ def process_stickers():
         return 0
 
     # Manually Create Sticker Metadata and process them.
-    for file_name in os.listdir(target_path):
-        file_path = os.path.join(target_path, file_name)
-
-        if os.path.isfile(file_path):
+    # scandir keeps the type/stat info from a single directory read, avoiding
+    # the extra stat() syscalls per entry that listdir + isfile + getctime cost.
+    pairs = []
+    with os.scandir(target_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
             try:
                 # Process the sticker file as a non-image item
                 data = {
-                    "uri": os.path.join(uri_base, file_name),
+                    "uri": os.path.join(uri_base, entry.name),
                     "description": "",
-                    "creation_timestamp": int(os.path.getctime(file_path)),  # Use file creation time
+                    "creation_timestamp": int(entry.stat().st_ctime),  # Use file creation time
                 }
-                media_processor.process_media_item(data, save_directory)
+                pairs.append((data, save_directory))
             except Exception as e:
-                logging.error(f"Failed to process sticker file: {file_path}. Error: {e}")
+                logging.error(f"Failed to process sticker file: {entry.path}. Error: {e}")
+
+    process_media_items(pairs)
 
     processed_count = media_processor.get_total_processed() - starting_count
     logging.info(f"Processed {processed_count} Sticker Media Items in {save_directory}.")
 
 
+def collect_json_shards() -> dict:
+    """
+    Buckets every JSON shard under the activity directory by section in a
+    single rglob sweep, instead of one glob (and directory walk) per section.
+
+    Returns:
+        dict: Section name -> list of shard paths.
+    """
+    shards = {'albums': [], 'posts': [], 'misc': [], 'videos': [], 'stories': [], 'reels': []}
+
+    activity_root = pathlib.Path(args.path) / 'your_facebook_activity'
+    for path in activity_root.rglob('*.json'):
+        name = path.name
+        parent = path.parent.name
+        if parent == 'album':
+            shards['albums'].append(str(path))
+        elif name.startswith('your_posts__check_ins__photos_and_videos') and parent == 'posts':
+            shards['posts'].append(str(path))
+        elif name.startswith('your_uncategorized_photos') and parent == 'posts':
+            shards['misc'].append(str(path))
+        elif name.startswith('your_videos') and parent == 'posts':
+            shards['videos'].append(str(path))
+        elif name.startswith('archived_stories') and parent == 'stories':
+            shards['stories'].append(str(path))
+        elif name.startswith('your_reels') and parent == 'short_videos':
+            shards['reels'].append(str(path))
+
+    return shards
+
+
 def main() -> None:
 
     logging.info(f"Starting Processing in {args.path}.")
 
-    extract_posts()
-    extract_albums()
-    extract_misc()
-    extract_videos()
-    extract_stories()
-    process_reels()
+    shards = collect_json_shards()
+
+    extract_posts(shards['posts'])
+    extract_albums(shards['albums'])
+    extract_misc(shards['misc'])
+    extract_videos(shards['videos'])
+    extract_stories(shards['stories'])
+    process_reels(shards['reels'])
     process_stickers()
 
+    media_processor.close()
+
     logging.info(f"Done! Processed {media_processor.get_total_processed()} files.")
 
 
 if __name__ == "__main__":
+    log_listener = setup_logging()
+
     parser = argparse.ArgumentParser(description="MetaBridge EXIF Metadata Processor.")
     parser.add_argument("path", type=str, help="Path to the `your_facebook_activity` directory")
     parser.add_argument("-d", "--save-path", type=str, default="./processed/",
                         help="Directory to save processed files (default: ./processed/)")
     parser.add_argument("--dry-run", action="store_true", help="Run without making changes")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 4,
+                        help="Number of worker threads for the file-copy pool (default: CPU count)")
+    parser.add_argument("--io-uring", action="store_true",
+                        help="Batch file copies through io_uring (Linux, requires liburing)")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
     args = parser.parse_args()
 
     # Initialize MediaProcessor
-    media_processor = MediaProcessor(args.path, args.save_path, args.dry_run)
+    media_processor = MediaProcessor(args.path, args.save_path, args.dry_run,
+                                     use_io_uring=args.io_uring, workers=args.workers)
+
+    # atexit runs hooks in LIFO order, so register the listener's stop after
+    # the MediaProcessor's TZ restore hook: the listener then drains and
+    # formats any queued records before the process timezone is put back.
+    atexit.register(log_listener.stop)
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -1,27 +1,80 @@
 import os
 import logging
+import shutil
 import time
-import pytz
 
 from datetime import datetime, timezone
 from PIL import Image
-from piexif import load, dump, ExifIFD, ImageIFD
+from piexif import load, dump, insert, ExifIFD, ImageIFD
 
-la_timezone = pytz.timezone("America/Los_Angeles")
+# Magic-byte prefixes for the formats this handler needs to distinguish
+_FORMAT_SIGNATURES = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'GIF8', 'GIF'),
+    (b'II*\x00', 'TIFF'),
+    (b'MM\x00*', 'TIFF'),
+    (b'BM', 'BMP'),
+)
+
+# Formats whose EXIF segment piexif can read/patch directly
+_PIEXIF_FORMATS = {'JPEG', 'TIFF', 'WEBP'}
 
 
 class ExifImageHandler:
     def __init__(self, photo_uri: str):
         self.photo_uri = photo_uri
-        self.img, self.exif_dict = self._load_image_exif()
-        logging.debug(f"Loaded {self.photo_uri}")
+        self.format, self.exif_dict = self._load_image_exif()
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Loaded {self.photo_uri}")
+
+    def __enter__(self) -> "ExifImageHandler":
+        return self
 
-    def _load_image_exif(self) -> tuple[Image.Image, dict]:
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Releases the handler's EXIF data. The dict can carry a large embedded
+        thumbnail, so dropping it deterministically keeps memory flat across
+        long runs; the JPEG path never opens the image itself, so there are
+        no pixel buffers or file descriptors left to release.
+        """
+        self.exif_dict = None
+
+    @staticmethod
+    def _sniff_format(header: bytes) -> str | None:
+        for signature, image_format in _FORMAT_SIGNATURES:
+            if header.startswith(signature):
+                return image_format
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return 'WEBP'
+        return None
+
+    def _load_image_exif(self) -> tuple[str | None, dict]:
+        """
+        Identify the image format from its header bytes and read its EXIF
+        segment, without decoding any pixel data.
+        """
         try:
-            img = Image.open(self.photo_uri)
-            exif_data = img.info.get("exif")
-            exif_dict = load(exif_data) if exif_data else {"Exif": {}, "0th": {}, "1st": {}, "thumbnail": None}
-            return img, exif_dict
+            with open(self.photo_uri, 'rb') as file:
+                header = file.read(32)
+            image_format = self._sniff_format(header)
+            if image_format in _PIEXIF_FORMATS:
+                exif_dict = load(self.photo_uri)
+            else:
+                # Formats piexif cannot read directly (e.g. a PNG eXIf
+                # chunk) may still carry EXIF; Image.open only parses the
+                # headers here, so no pixel decode happens until save().
+                with Image.open(self.photo_uri) as img:
+                    exif_bytes = img.info.get('exif')
+                if exif_bytes:
+                    exif_dict = load(exif_bytes)
+                else:
+                    exif_dict = {"Exif": {}, "0th": {}, "1st": {}, "thumbnail": None}
+            return image_format, exif_dict
         except FileNotFoundError:
             logging.error(f"File not found: {self.photo_uri}")
             raise
@@ -40,7 +93,8 @@ class ExifImageHandler:
         exif_dt = dt.strftime("%Y:%m:%d %H:%M:%S")
         self.exif_dict['Exif'][ExifIFD.DateTimeOriginal] = exif_dt
         self.creation_timestamp = creation_timestamp
-        logging.debug(f"Set creation timestamp to {exif_dt}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Set creation timestamp to {exif_dt}")
 
     def set_description(self, description: str) -> None:
         """
@@ -51,7 +105,8 @@ class ExifImageHandler:
         """
         if description:
             self.exif_dict['0th'][ImageIFD.ImageDescription] = description
-            logging.debug(f"Set description to \"{description}\"")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Set description to \"{description}\"")
 
     def save(self, save_path: str) -> None:
         """
@@ -60,20 +115,29 @@ class ExifImageHandler:
         Args:
             save_path (str): Full path (including file name) where the image will be saved.
         """
-        # Render EXIF bytes
+        # Render EXIF bytes; the caller is responsible for ensuring the
+        # destination directory exists.
         exif_bytes = dump(self.exif_dict)
 
-        # Ensure the directory for the save path exists
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-
-        # Determine the format based on the file extension or the original image format
+        # Determine the format based on the file extension or the sniffed image format
         _, file_ext = os.path.splitext(save_path)
         file_ext = file_ext.lower().replace(".", "")
-        image_format = self.img.format if self.img.format else file_ext.upper()
-
-        # Save the image with updated EXIF metadata
-        self.img.save(save_path, format=image_format, exif=exif_bytes)
-        logging.debug(f"Saved image in {image_format} format with updated EXIF: {save_path}")
+        image_format = self.format if self.format else file_ext.upper()
+
+        if image_format == 'JPEG' and file_ext in ('jpg', 'jpeg'):
+            # Fast path for JPEG: copy the file byte-for-byte and patch the
+            # APP1 segment in place, skipping the lossy libjpeg re-encode.
+            shutil.copyfile(self.photo_uri, save_path)
+            insert(exif_bytes, save_path)
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Patched EXIF in place for JPEG: {save_path}")
+        else:
+            # Decode and re-save with updated EXIF metadata; only formats
+            # piexif cannot patch in place pay for the pixel decode.
+            with Image.open(self.photo_uri) as img:
+                img.save(save_path, format=image_format, exif=exif_bytes)
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Saved image in {image_format} format with updated EXIF: {save_path}")
 
         # Update the timestamps on the new file
         self.update_file_timestamps(save_path)
@@ -86,21 +150,6 @@ class ExifImageHandler:
             except Exception as e:
                 logging.error(f"Error removing old file {self.photo_uri}: {e}")
 
-    def get_all_exif_data(self) -> dict:
-        """
-        Retrieve all EXIF data in a readable format.
-
-        Returns:
-            dict: All EXIF data categorized by IFD sections.
-        """
-        all_exif = {}
-        for ifd, tags in self.exif_dict.items():
-            all_exif[ifd] = {}
-            if tags:
-                for tag, value in tags.items():
-                    all_exif[ifd][tag] = value
-        return all_exif
-
     def update_file_timestamps(self, image_path) -> None:
         """
         Update the file's creation and modification timestamps using the set creation timestamp.
@@ -109,4 +158,5 @@ class ExifImageHandler:
         timestamp = getattr(self, 'creation_timestamp', time.time())
 
         os.utime(image_path, (timestamp, timestamp))
-        logging.debug(f"Updated file timestamps for: {image_path}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Updated file timestamps for: {image_path}")
@@ -1,19 +1,255 @@
 import os
+import atexit
+import collections
 import logging
 import shutil
-import pytz
 import time
+import threading
 
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from lib.ExifImageHandler import ExifImageHandler  # Custom utility for handling EXIF metadata
 
+try:
+    from pybloom_live import ScalableBloomFilter  # Optional; compact dedup bookkeeping
+except ImportError:
+    ScalableBloomFilter = None
+
+try:
+    import liburing  # Optional; enables the io_uring copy backend on Linux
+except ImportError:
+    liburing = None
+
+
+# Extensions routed through the EXIF path; frozenset so the hash is computed
+# once instead of a fresh set literal being built per item
+_IMAGE_EXTS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp'})
+
+# Timezone used for timestamp-based file names; applied to the process TZ so
+# filenames can be formatted through libc instead of a pytz conversion per item
+_FILENAME_TIMEZONE = "America/Los_Angeles"
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy a file using os.copy_file_range when available, so the bytes move
+    in-kernel (and as a reflink on capable filesystems) instead of being
+    looped through userspace buffers. Falls back to a buffered copy.
+
+    Args:
+        src (str): Source file path.
+        dst (str): Destination file path.
+    """
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        if hasattr(os, 'copy_file_range'):
+            try:
+                size = os.fstat(src_file.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    moved = os.copy_file_range(src_file.fileno(), dst_file.fileno(), size - copied)
+                    if moved == 0:
+                        break
+                    copied += moved
+                return
+            except OSError:
+                # Cross-device or unsupported filesystem; restart with a buffered copy
+                src_file.seek(0)
+                dst_file.seek(0)
+                dst_file.truncate()
+        shutil.copyfileobj(src_file, dst_file, 1024 * 1024)
+
+
+def _exif_worker(task: tuple) -> None:
+    """
+    Process-pool worker: writes one image with updated EXIF metadata.
+
+    piexif's load/dump are pure Python and GIL-bound, so image items run in
+    worker processes; the task payload is just four small values and the
+    result is a written file, keeping IPC negligible.
+
+    Args:
+        task (tuple): (src_path, save_path, timestamp, description).
+    """
+    src_path, save_path, timestamp, description = task
+    try:
+        with ExifImageHandler(src_path) as exif_handler:
+            exif_handler.set_creation_timestamp(timestamp)
+            exif_handler.set_description(description)
+            exif_handler.save(save_path)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Processed and saved image: {save_path}")
+    except Exception as e:
+        logging.error(f"Error processing image metadata for {src_path}: {e}")
+        logging.warning(f"Copying image without metadata changes: {src_path}")
+        _fast_copy(src_path, save_path)
+        os.utime(save_path, (timestamp, timestamp))
+
+
+class _PendingCopy:
+    """Bookkeeping for one file copy in flight on the ring."""
+
+    __slots__ = ('src_fd', 'dst_fd', 'size', 'offset', 'buffer', 'dst_path', 'error')
+
+    def __init__(self, src_fd: int, dst_fd: int, size: int, dst_path: str):
+        self.src_fd = src_fd
+        self.dst_fd = dst_fd
+        self.size = size
+        self.offset = 0  # Bytes copied so far
+        self.buffer = None
+        self.dst_path = dst_path
+        self.error = None
+
+
+class _UringCopyBatcher:
+    """
+    Batches file copies through a shared io_uring so many reads and writes
+    stay in flight at once, instead of one blocking syscall pair per file.
+    Files are copied in bounded chunks; every completion result is validated
+    against the requested length, with short writes retried, so truncated
+    transfers (e.g. the kernel's per-call MAX_RW_COUNT cap) are never
+    reported as success.
+    """
+
+    QUEUE_DEPTH = 256  # SQ entries; one per in-flight file per phase
+    MAX_BATCH_ITEMS = 128  # Files per batch; bounds buffer memory with CHUNK_BYTES
+    CHUNK_BYTES = 1024 * 1024  # Per-file chunk, well under MAX_RW_COUNT
+
+    def __init__(self):
+        self._ring = liburing.Ring()
+        liburing.io_uring_queue_init(self.QUEUE_DEPTH, self._ring)
+        self._lock = threading.Lock()
+        self._pending = []  # _PendingCopy items not yet submitted
+        self._results = []  # (dst_path, error string or None)
+
+    def submit(self, src: str, dst: str) -> None:
+        """
+        Queue a copy of src to dst; the batch is submitted to the kernel once
+        enough copies have accumulated.
+        """
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            size = os.fstat(src_fd).st_size
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError:
+            os.close(src_fd)
+            raise
+
+        with self._lock:
+            self._pending.append(_PendingCopy(src_fd, dst_fd, size, dst))
+            if len(self._pending) >= self.MAX_BATCH_ITEMS:
+                self._submit_batch()
+
+    def _reap(self, items: list) -> list:
+        """
+        Submit the prepared SQEs and wait for one CQE per item. Negative
+        results are recorded as errors on the matching item.
+
+        Args:
+            items (list): _PendingCopy items, indexed by SQE user_data.
 
-# Set the timezone for timestamp formatting
-la_timezone = pytz.timezone("America/Los_Angeles")
+        Returns:
+            list: Byte count per item, or None where an error was recorded.
+        """
+        liburing.io_uring_submit(self._ring)
+
+        results = [None] * len(items)
+        cqe = liburing.Cqe()
+        seen = 0
+        while seen < len(items):
+            liburing.io_uring_wait_cqe(self._ring, cqe)
+            ready = liburing.io_uring_cq_ready(self._ring)
+            for i in range(ready):
+                entry = cqe[i]
+                if entry.res < 0:
+                    items[entry.user_data].error = os.strerror(-entry.res)
+                else:
+                    results[entry.user_data] = entry.res
+            liburing.io_uring_cq_advance(self._ring, ready)
+            seen += ready
+        return results
+
+    def _submit_batch(self) -> None:
+        # Caller must hold self._lock
+        pending = self._pending
+
+        while True:
+            active = [item for item in pending if item.error is None and item.offset < item.size]
+            if not active:
+                break
+
+            # Read phase: one chunk per file, sized to what remains
+            for index, item in enumerate(active):
+                item.buffer = bytearray(min(self.CHUNK_BYTES, item.size - item.offset))
+                sqe = liburing.io_uring_get_sqe(self._ring)
+                liburing.io_uring_prep_read(sqe, item.src_fd, item.buffer, item.offset)
+                sqe.user_data = index
+            read_lengths = self._reap(active)
+
+            # Write phase: write exactly the bytes each read returned,
+            # retrying until every chunk is fully on disk
+            writes = []  # [item, chunk bytes, bytes written]
+            for item, read_length in zip(active, read_lengths):
+                if item.error is not None:
+                    continue
+                if read_length == 0:
+                    item.error = "unexpected end of file"
+                    continue
+                chunk = item.buffer if read_length == len(item.buffer) else item.buffer[:read_length]
+                writes.append([item, chunk, 0])
+
+            while writes:
+                for index, (item, chunk, written) in enumerate(writes):
+                    remainder = chunk if written == 0 else chunk[written:]
+                    sqe = liburing.io_uring_get_sqe(self._ring)
+                    liburing.io_uring_prep_write(sqe, item.dst_fd, remainder, item.offset + written)
+                    sqe.user_data = index
+                write_lengths = self._reap([entry[0] for entry in writes])
+
+                retries = []
+                for entry, write_length in zip(writes, write_lengths):
+                    item, chunk, written = entry
+                    if item.error is not None:
+                        continue
+                    if write_length == 0:
+                        item.error = "short write"
+                        continue
+                    written += write_length
+                    if written < len(chunk):
+                        retries.append([item, chunk, written])
+                    else:
+                        item.offset += len(chunk)
+                writes = retries
+
+        for item in pending:
+            os.close(item.src_fd)
+            os.close(item.dst_fd)
+            item.buffer = None
+            self._results.append((item.dst_path, item.error))
+
+        self._pending = []
+
+    def flush(self) -> list:
+        """
+        Submit any still-queued copies and return accumulated results.
+
+        Returns:
+            list: (dst_path, error) tuples; error is None on success.
+        """
+        with self._lock:
+            if self._pending:
+                self._submit_batch()
+            results, self._results = self._results, []
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._submit_batch()
+            liburing.io_uring_queue_exit(self._ring)
 
 
 class MediaProcessor:
-    def __init__(self, base_path: str, save_path: str, dry_run: bool = False):
+    def __init__(self, base_path: str, save_path: str, dry_run: bool = False, use_io_uring: bool = False,
+                 workers: int | None = None):
         """
         Initializes the MediaProcessor class.
 
@@ -21,12 +257,51 @@ class MediaProcessor:
             base_path (str): Base directory where source media files are located.
             save_path (str): Destination directory where processed media will be saved.
             dry_run (bool): If True, simulate operations without making actual changes.
+            use_io_uring (bool): If True, batch non-image copies through io_uring
+                when the liburing bindings are available (Linux only).
+            workers (int | None): Thread count for the I/O-bound copy pool
+                (default: CPU count).
         """
         self.base_path = base_path
         self.save_path = save_path
-        self.metadata = {}
         self.is_dry_run = dry_run
-        self.processed_items = set()  # (URI, save_directory) pairs
+        self._set_timezone()
+
+        # Heavy work is farmed out and gathered in flush(): CPU-bound EXIF
+        # rewrites go to a process pool (piexif is GIL-bound), I/O-bound
+        # copies to a thread pool. Both are created lazily.
+        self._workers = workers or os.cpu_count() or 4
+        self._process_pool = None
+        self._thread_pool = None
+        self._pending = []  # (future, processed_items key) pairs
+        self._inflight_keys = set()  # Keys submitted but not yet gathered
+        self._lock = threading.Lock()  # Guards shared bookkeeping under threaded processing
+
+        # Dedup bookkeeping for (URI, save_directory) pairs. With the bloom
+        # filter this costs ~10 bits per item instead of the full strings; a
+        # small LRU of recent exact keys confirms bloom hits cheaply.
+        self._processed_count = 0
+        if ScalableBloomFilter is not None:
+            self._seen_bloom = ScalableBloomFilter(initial_capacity=1_000_000, error_rate=0.001)
+            self._seen_recent = collections.OrderedDict()  # Capped LRU of exact keys
+            self._seen_exact = None
+        else:
+            self._seen_bloom = None
+            self._seen_recent = None
+            self._seen_exact = set()
+        self._dir_name_counts = {}  # directory -> {file name: highest conflict counter}
+        self._ensured_dirs = set()  # Directories already created, to skip repeat makedirs calls
+
+        self._uring_copier = None
+        self._uring_inflight = {}  # save_path -> (processed_items key, timestamp)
+        if use_io_uring:
+            if liburing is None:
+                logging.warning("liburing is not installed; io_uring backend disabled")
+            else:
+                try:
+                    self._uring_copier = _UringCopyBatcher()
+                except OSError as e:
+                    logging.warning(f"io_uring unavailable ({e}); falling back to blocking copies")
 
     def process_media_item(self, data: dict, save_directory: str) -> None:
         """
@@ -40,11 +315,12 @@ class MediaProcessor:
 
         # Skip Non-Local URIs
         if not uri.startswith("your_facebook_activity"):
-            logging.debug(f"Skipped processing for irrelevant URI: {uri}")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Skipped processing for irrelevant URI: {uri}")
             return
 
-        # Create metadata object
-        self.metadata = {
+        # Create metadata object local to this call so concurrent items don't clobber each other
+        metadata = {
             "uri_path": os.path.join(self.base_path, uri),
             "description": data.get('description', ''),
             "creation_timestamp": data.get('creation_timestamp', int(time.time())),
@@ -52,94 +328,269 @@ class MediaProcessor:
             "save_directory": save_directory,
         }
 
-        self.metadata["timestamp"] = self.metadata["taken_timestamp"] or self.metadata["creation_timestamp"]
+        metadata["timestamp"] = metadata["taken_timestamp"] or metadata["creation_timestamp"]
 
         # Check if the (URI, save_directory) pair is already processed
-        if (self.metadata["uri_path"], self.metadata["save_directory"]) in self.processed_items:
-            logging.debug(f"Skipping already processed item: (URI: {uri}, Directory: {save_directory})")
+        if self._is_processed(metadata):
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Skipping already processed item: (URI: {uri}, Directory: {save_directory})")
             return
 
         # Determine file type and process accordingly
-        file_extension = os.path.splitext(self.metadata["uri_path"])[1].lower()
-        if file_extension in {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}:
-            self._copy_image()
+        file_extension = metadata["uri_path"].rpartition('.')[2].lower()
+        if file_extension in _IMAGE_EXTS:
+            self._copy_image(metadata)
         else:
-            self._copy_non_image()
+            self._copy_non_image(metadata)
 
-    def _copy_image(self) -> None:
+    def _copy_image(self, metadata: dict) -> None:
         """
-        Handles image files by updating their EXIF metadata and saving them.
+        Handles image files by submitting an EXIF rewrite to the process pool.
+        The worker falls back to a plain copy if the metadata update fails.
+
+        Args:
+            metadata (dict): Normalized metadata for the media item being processed.
         """
         # Determine file type and process accordingly
         if self.is_dry_run:
-            logging.info(f"[Dry Run] Would process and save: {self.metadata['uri_path']}")
+            logging.info(f"[Dry Run] Would process and save: {metadata['uri_path']}")
             return
 
         try:
-            base_file_name = self._generate_filename()
-            save_path = self._generate_save_path(self.metadata["save_directory"], base_file_name)
+            base_file_name = self._generate_filename(metadata)
+            save_path = self._generate_save_path(metadata["save_directory"], base_file_name)
 
             if save_path is None:
                 return
 
-            exif_handler = ExifImageHandler(self.metadata["uri_path"])
-            exif_handler.set_creation_timestamp(self.metadata["timestamp"])
-            exif_handler.set_description(self.metadata["description"])
-            exif_handler.save(save_path)
+            self._ensure_dir(os.path.dirname(save_path))
 
-            logging.debug(f"Processed and saved image: {save_path}")
-            self.processed_items.add((self.metadata["uri_path"], self.metadata["save_directory"]))
+            key = (metadata["uri_path"], metadata["save_directory"])
+            task = (metadata["uri_path"], save_path, metadata["timestamp"], metadata["description"])
+            future = self._get_process_pool().submit(_exif_worker, task)
+            with self._lock:
+                self._inflight_keys.add(key)
+                self._pending.append((future, key))
 
         except Exception as e:
-            logging.error(f"Error processing image metadata for {self.metadata['uri_path']}: {e}")
-            logging.warning(f"Copying image without metadata changes: {save_path}")
-            self._copy_non_image()
+            logging.error(f"Error processing image metadata for {metadata['uri_path']}: {e}")
 
-    def _copy_non_image(self) -> None:
+    def _copy_non_image(self, metadata: dict) -> None:
         """
         Processes non-image files by renaming and moving them to the target directory.
+        The copy itself runs on the thread pool (or the io_uring batcher).
+
+        Args:
+            metadata (dict): Normalized metadata for the media item being processed.
         """
         if self.is_dry_run:
-            logging.info(f"[Dry Run] Would process and save: {self.metadata['uri_path']}")
+            logging.info(f"[Dry Run] Would process and save: {metadata['uri_path']}")
             return
 
         try:
-            base_file_name = self._generate_filename()
-            save_path = self._generate_save_path(self.metadata["save_directory"], base_file_name)
+            base_file_name = self._generate_filename(metadata)
+            save_path = self._generate_save_path(metadata["save_directory"], base_file_name)
 
             if save_path is None:
                 return
 
             # Ensure the directory for the save path exists
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            self._ensure_dir(os.path.dirname(save_path))
 
-            # Copy the file
-            shutil.copy(self.metadata["uri_path"], save_path)
-            os.utime(save_path, (self.metadata["timestamp"], self.metadata["timestamp"]))
+            key = (metadata["uri_path"], metadata["save_directory"])
 
-            logging.debug(f"Moved non-image file to: {save_path}")
-            self.processed_items.add((self.metadata["uri_path"], self.metadata["save_directory"]))
+            if self._uring_copier is not None:
+                # Queue the copy on the ring; completion is finalized in flush()
+                self._uring_copier.submit(metadata["uri_path"], save_path)
+                with self._lock:
+                    self._inflight_keys.add(key)
+                    self._uring_inflight[save_path] = (key, metadata["timestamp"])
+                return
+
+            future = self._get_thread_pool().submit(
+                self._copy_task, metadata["uri_path"], save_path, metadata["timestamp"])
+            with self._lock:
+                self._inflight_keys.add(key)
+                self._pending.append((future, key))
 
         except Exception as e:
-            logging.error(f"Error moving non-image file {self.metadata['uri_path']}: {e}")
+            logging.error(f"Error moving non-image file {metadata['uri_path']}: {e}")
+
+    def _copy_task(self, src: str, dst: str, timestamp: int) -> None:
+        """
+        Thread-pool task: copies one non-image file and applies its timestamp.
+        """
+        _fast_copy(src, dst)
+        os.utime(dst, (timestamp, timestamp))
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Moved non-image file to: {dst}")
+
+    def flush(self) -> None:
+        """
+        Waits for all submitted EXIF rewrites and copies, recording the items
+        that completed. Called after each section's items are submitted.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        future_keys = {future: key for future, key in pending}
+        for future in as_completed(future_keys):
+            key = future_keys[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error processing {key[0]}: {e}")
+            else:
+                self._mark_processed(key)
+            with self._lock:
+                self._inflight_keys.discard(key)
+
+        if self._uring_copier is None:
+            return
+
+        for save_path, error in self._uring_copier.flush():
+            with self._lock:
+                key, timestamp = self._uring_inflight.pop(save_path)
+
+            if error:
+                logging.error(f"Error moving non-image file {key[0]}: {error}")
+            else:
+                os.utime(save_path, (timestamp, timestamp))
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug(f"Moved non-image file to: {save_path}")
+                self._mark_processed(key)
+
+            with self._lock:
+                self._inflight_keys.discard(key)
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pools and releases the io_uring, if created.
+        Call after the final flush(); the processor cannot be reused afterwards.
+        """
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
+        if self._uring_copier is not None:
+            self._uring_copier.close()
+            self._uring_copier = None
 
     # Helper Methods
-    def _generate_filename(self) -> str:
+    _RECENT_CAPACITY = 4096  # Exact keys kept to confirm bloom filter hits
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._process_pool
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self._workers)
+        return self._thread_pool
+
+    def _mark_processed(self, key: tuple) -> None:
+        """
+        Records a (URI, save_directory) pair as processed.
+
+        Args:
+            key (tuple): (uri_path, save_directory) identifying the item.
+        """
+        with self._lock:
+            self._processed_count += 1
+            if self._seen_bloom is None:
+                self._seen_exact.add(key)
+                return
+            self._seen_bloom.add(key)
+            self._seen_recent[key] = None
+            if len(self._seen_recent) > self._RECENT_CAPACITY:
+                self._seen_recent.popitem(last=False)
+
+    def _is_processed(self, metadata: dict) -> bool:
+        """
+        Checks whether this item was already processed. A bloom filter miss is
+        definitive; on a hit the recent-key LRU is consulted, and an LRU miss
+        (possible bloom false positive) is settled against the filesystem.
+
+        Args:
+            metadata (dict): Normalized metadata for the media item.
+
+        Returns:
+            bool: True if the item should be skipped.
+        """
+        key = (metadata["uri_path"], metadata["save_directory"])
+        with self._lock:
+            if key in self._inflight_keys:
+                return True
+            if self._seen_bloom is None:
+                return key in self._seen_exact
+            if key not in self._seen_bloom:
+                return False
+            if key in self._seen_recent:
+                return True
+        return os.path.exists(os.path.join(metadata["save_directory"], self._generate_filename(metadata)))
+
+    def _set_timezone(self) -> None:
+        """
+        Points the process timezone at the filename timezone so that
+        time.localtime in _generate_filename resolves it through libc,
+        which is several times faster than a pytz conversion per item.
+        The prior TZ is restored at interpreter exit.
+        """
+        if not hasattr(time, 'tzset'):
+            return
+
+        prior_tz = os.environ.get('TZ')
+
+        def restore():
+            if prior_tz is None:
+                os.environ.pop('TZ', None)
+            else:
+                os.environ['TZ'] = prior_tz
+            time.tzset()
+
+        os.environ['TZ'] = _FILENAME_TIMEZONE
+        time.tzset()
+        atexit.register(restore)
+
+    def _ensure_dir(self, directory: str) -> None:
+        """
+        Creates a directory if this processor hasn't already, so makedirs is
+        one syscall per directory rather than one per media item.
+
+        Args:
+            directory (str): Directory that must exist before writing into it.
+        """
+        if directory in self._ensured_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._ensured_dirs.add(directory)
+
+    def _generate_filename(self, metadata: dict) -> str:
         """
         Creates a base file name based on the metadata's timestamp.
 
+        Args:
+            metadata (dict): Normalized metadata for the media item being processed.
+
         Returns:
             str: A timestamp-based file name.
         """
-        _, uri_file_name = os.path.split(self.metadata['uri_path'])
+        _, uri_file_name = os.path.split(metadata['uri_path'])
         _, file_ext = os.path.splitext(uri_file_name)
-        file_dt = datetime.fromtimestamp(self.metadata['timestamp'], tz=la_timezone).strftime("%Y-%m-%d_%H.%M.%S")
+        file_dt = time.strftime("%Y-%m-%d_%H.%M.%S", time.localtime(metadata['timestamp']))
         return f"{file_dt}{file_ext}"
 
     def _generate_save_path(self, directory: str, base_file_name: str) -> str:
         """
         Creates the final save path while resolving naming conflicts by appending a counter to the file name if needed.
 
+        Conflicts are resolved against an in-memory table of names per directory
+        (seeded from the directory listing on first use), so resolution is O(1)
+        amortized instead of an os.path.exists() probe per collision.
+
         Args:
             directory (str): Directory where the file will be saved.
             base_file_name (str): Base file name.
@@ -148,17 +599,34 @@ class MediaProcessor:
             str: A unique file path with no conflicts.
         """
         file_name, file_ext = os.path.splitext(base_file_name)
-        file_path = os.path.join(directory, base_file_name)
-        counter = 1
 
-        while os.path.exists(file_path):
-            new_file_name = f"{file_name}_{counter}{file_ext}"
-            file_path = os.path.join(directory, new_file_name)
-            counter += 1
-
-        if counter > 1:
+        with self._lock:
+            counts = self._dir_name_counts.get(directory)
+            if counts is None:
+                # Seed with names already on disk so reruns stay conflict-free
+                counts = {}
+                if os.path.isdir(directory):
+                    for existing_name in os.listdir(directory):
+                        counts[existing_name] = 0
+                self._dir_name_counts[directory] = counts
+
+            if base_file_name not in counts:
+                counts[base_file_name] = 0
+                return os.path.join(directory, base_file_name)
+
+            counter = counts[base_file_name]
+            while True:
+                counter += 1
+                candidate = f"{file_name}_{counter}{file_ext}"
+                if candidate not in counts:
+                    break
+
+            counts[base_file_name] = counter
+            counts[candidate] = 0
+
+        file_path = os.path.join(directory, candidate)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
             logging.debug(f"Resolved filename conflict: {file_path}")
-
         return file_path
 
     def _extract_taken_timestamp(self, media_item) -> int | None:
@@ -171,11 +639,13 @@ class MediaProcessor:
         Returns:
             int | None: Extracted timestamp, or None if unavailable.
         """
-        exif_data_list = media_item.get("media_metadata", {}).get("photo_metadata", {}).get("exif_data", [])
-        for exif_data in exif_data_list:
-            if "taken_timestamp" in exif_data:
-                return exif_data["taken_timestamp"]
-        return None
+        # Single dict walk (no transient empty-dict defaults) and a C-level scan
+        media_metadata = media_item.get("media_metadata")
+        photo_metadata = media_metadata.get("photo_metadata") if media_metadata else None
+        exif_data_list = photo_metadata.get("exif_data") if photo_metadata else None
+        if not exif_data_list:
+            return None
+        return next((e["taken_timestamp"] for e in exif_data_list if "taken_timestamp" in e), None)
 
     def extract_attachment_data(self, entry):
         """
@@ -198,4 +668,4 @@ class MediaProcessor:
         Returns:
             int: Total number of files processed.
         """
-        return len(self.processed_items)
+        return self._processed_count